@@ -44,6 +44,20 @@ sudo systemctl daemon-reload
 sudo systemctl enable tornado.service flask.service
 sudo systemctl start tornado.service flask.service
 
+# Wait for Flask to finish warm-up and reach Tornado before declaring success
+echo "⏳ Waiting for Flask readiness..."
+for i in $(seq 1 30); do
+    if curl -f -s http://localhost:5000/ready > /dev/null 2>&1; then
+        echo "✅ Flask ready: $(curl -s http://localhost:5000/ready)"
+        break
+    elif [ $i -eq 30 ]; then
+        echo "❌ Flask did not become ready"
+        curl -s http://localhost:5000/ready || true
+        exit 1
+    fi
+    sleep 1
+done
+
 # Check status
 echo "✅ Deployment complete! Checking status..."
 sudo systemctl status tornado.service --no-pager -l
@@ -54,6 +68,8 @@ echo "🌐 Applications are running:"
 echo "   Flask app: http://$(hostname -I | awk '{print $1}'):5000"
 echo "   Tornado app: http://$(hostname -I | awk '{print $1}'):8888"
 echo ""
+echo "   Readiness: http://$(hostname -I | awk '{print $1}'):5000/ready"
+echo ""
 echo "📋 Management commands:"
 echo "   sudo systemctl status tornado.service flask.service"
 echo "   sudo systemctl restart tornado.service flask.service"
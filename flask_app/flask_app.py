@@ -1,13 +1,111 @@
+import time
+
+# Measured from the top of the module so import cost shows up in /ready
+_import_started = time.perf_counter()
+
 from flask import Flask, render_template, request, jsonify
 import requests
 import asyncio
 import aiohttp
+import json
+import logging
 import os
+from http.cookiejar import DefaultCookiePolicy
 
 app = Flask(__name__)
 
 # Configuration
 TORNADO_BASE_URL = os.getenv("TORNADO_BASE_URL", "http://localhost:8888")
+READY_CHECK_TIMEOUT = float(os.getenv("READY_CHECK_TIMEOUT", "2"))
+
+# Shared connection pool for the sync proxy, so warm-up can pre-open
+# upstream connections that real requests then reuse. Sharing it across
+# request threads is safe here: the session is never reconfigured after
+# import, urllib3's pool is thread-safe, and the only per-session mutable
+# state (the cookie jar) is disabled so nothing leaks between callers.
+# A per-thread session would not help, as the dev server starts a new
+# thread for every request and would never reuse a warmed connection.
+upstream_session = requests.Session()
+upstream_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+# Startup timings and warm-up state, reported by /ready
+startup_stats = {
+    'warmed_up': False,
+    'import_seconds': None,
+    'warmup_seconds': None,
+}
+
+def flag_requested(name):
+    """True when the caller set the named opt-in flag, e.g. raw=1"""
+    return request.values.get(name, '').lower() in ('1', 'true', 'yes')
+
+def is_json_content_type(content_type):
+    """True for application/json and +json media types"""
+    mimetype = content_type.split(';', 1)[0].strip().lower()
+    return mimetype == 'application/json' or mimetype.endswith('+json')
+
+def content_type_charset(content_type):
+    """Return the lowercased charset parameter of a content type, or None"""
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            return value.strip().strip('"').lower()
+    return None
+
+def raw_response(tornado_url, status_code, content_type, content):
+    """Return upstream bytes unchanged, with the envelope fields as headers"""
+    return app.response_class(
+        content,
+        content_type=content_type or 'application/octet-stream',
+        headers={
+            'X-Proxy-Success': 'true',
+            'X-Upstream-Status': str(status_code),
+            'X-Url-Called': tornado_url,
+        }
+    )
+
+def embeddable_json(content_type, content):
+    """Return the stripped body if it can be spliced into the envelope, else None"""
+    if not is_json_content_type(content_type):
+        return None
+    if content_type_charset(content_type) not in (None, 'utf-8', 'utf8'):
+        return None
+
+    content = content.strip()
+    if not content:
+        return None
+
+    # The proxy forwards any endpoint, so the body must be checked. Decoding
+    # strictly first rejects BOMs, UTF-16/32 and lone surrogates, which
+    # json.loads would otherwise auto-detect on bytes. This is still a parse,
+    # but the bytes are spliced as-is without re-serializing
+    try:
+        json.loads(content.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return content
+
+def envelope_response(tornado_url, status_code, content_type, content, encoding=None, embed_json=False):
+    """Serialize the success envelope without a full jsonify round trip"""
+    head = json.dumps(
+        {'success': True, 'status_code': status_code, 'url_called': tornado_url},
+        separators=(',', ':')
+    )[:-1].encode('utf-8')
+
+    # With embed_json=1, valid UTF-8 JSON upstream bodies are embedded under
+    # response_json; anything else falls back to the response_text string
+    json_body = embeddable_json(content_type, content) if embed_json else None
+    if json_body is not None:
+        body = head + b',"response_json":' + json_body + b'}'
+    else:
+        try:
+            text = content.decode(encoding or 'utf-8', errors='replace')
+        except LookupError:
+            # Unknown upstream charset, as requests' response.text does
+            text = content.decode('utf-8', errors='replace')
+        body = head + b',"response_text":' + json.dumps(text).encode('utf-8') + b'}'
+
+    return app.response_class(body, mimetype='application/json')
 
 @app.route('/')
 def index():
@@ -27,14 +125,15 @@ def call_tornado():
         
         # Make request to Tornado app
         tornado_url = f"{TORNADO_BASE_URL}{endpoint}"
-        response = requests.get(tornado_url, timeout=30)
+        response = upstream_session.get(tornado_url, timeout=30)
+        content_type = response.headers.get('Content-Type', '')
         
-        return jsonify({
-            'success': True,
-            'status_code': response.status_code,
-            'response_text': response.text,
-            'url_called': tornado_url
-        })
+        if flag_requested('raw'):
+            return raw_response(tornado_url, response.status_code, content_type, response.content)
+        
+        return envelope_response(tornado_url, response.status_code, content_type,
+                                 response.content, response.encoding,
+                                 embed_json=flag_requested('embed_json'))
         
     except requests.exceptions.ConnectionError:
         return jsonify({
@@ -65,16 +164,19 @@ async def call_tornado_async():
         
         tornado_url = f"{TORNADO_BASE_URL}{endpoint}"
         
+        # Flask runs each async view in its own event loop, so an aiohttp
+        # session cannot be shared or pre-warmed across requests
         async with aiohttp.ClientSession() as session:
             async with session.get(tornado_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                response_text = await response.text()
+                content = await response.read()
+                content_type = response.headers.get('Content-Type', '')
                 
-                return jsonify({
-                    'success': True,
-                    'status_code': response.status,
-                    'response_text': response_text,
-                    'url_called': tornado_url
-                })
+                if flag_requested('raw'):
+                    return raw_response(tornado_url, response.status, content_type, content)
+                
+                return envelope_response(tornado_url, response.status, content_type,
+                                         content, response.charset,
+                                         embed_json=flag_requested('embed_json'))
                 
     except aiohttp.ClientConnectorError:
         return jsonify({
@@ -99,5 +201,52 @@ def health():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'service': 'Flask Tornado Proxy'})
 
+def tornado_reachable():
+    """Return True if the Tornado health endpoint answers with 200"""
+    try:
+        response = upstream_session.get(f"{TORNADO_BASE_URL}/health", timeout=READY_CHECK_TIMEOUT)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+def warm_up():
+    """Compile templates, prime caches and open upstream connections before serving"""
+    started = time.perf_counter()
+
+    # Compiling and rendering once caches the template and builds the URL map
+    app.jinja_env.get_template('index.html')
+    with app.test_request_context('/'):
+        render_template('index.html')
+
+    # Leaves a keep-alive connection in the sync route's shared pool; the
+    # async route opens its own per request (see call_tornado_async). An unreachable
+    # Tornado is not fatal here, /ready reports it instead
+    tornado_reachable()
+
+    startup_stats['warmup_seconds'] = time.perf_counter() - started
+    startup_stats['warmed_up'] = True
+    return startup_stats
+
+@app.route('/ready')
+def ready():
+    """Readiness check: warm-up finished and Tornado reachable"""
+    if not startup_stats['warmed_up']:
+        return jsonify({'status': 'warming', **startup_stats}), 503
+
+    if not tornado_reachable():
+        return jsonify({
+            'status': 'unavailable',
+            'error': 'Tornado app is not reachable.',
+            **startup_stats
+        }), 503
+
+    return jsonify({'status': 'ready', **startup_stats})
+
+startup_stats['import_seconds'] = time.perf_counter() - _import_started
+
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    warm_up()
+    app.logger.info("Flask import took %.3fs, warm-up took %.3fs",
+                    startup_stats['import_seconds'], startup_stats['warmup_seconds'])
     app.run(host='0.0.0.0', debug=True, port=5000)
\ No newline at end of file
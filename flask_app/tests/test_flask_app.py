@@ -1,7 +1,8 @@
 import pytest
 import asyncio
-from unittest.mock import patch, Mock
-from flask_app.flask_app import app
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
+import requests
+from flask_app.flask_app import app, startup_stats, warm_up
 
 @pytest.fixture
 def client():
@@ -20,12 +21,58 @@ def test_health_endpoint(client):
     assert response.status_code == 200
     assert response.json['status'] == 'healthy'
 
-@patch('flask_app.flask_app.requests.get')
+@pytest.fixture
+def cold_start():
+    """Reset warm-up state around readiness tests"""
+    startup_stats['warmed_up'] = False
+    startup_stats['warmup_seconds'] = None
+    yield
+    startup_stats['warmed_up'] = False
+    startup_stats['warmup_seconds'] = None
+
+@patch('flask_app.flask_app.upstream_session.get')
+def test_ready_before_warm_up(mock_get, client, cold_start):
+    """Test readiness fails until warm-up has run"""
+    mock_get.return_value = Mock(status_code=200)
+
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.json['status'] == 'warming'
+
+@patch('flask_app.flask_app.upstream_session.get')
+def test_ready_after_warm_up(mock_get, client, cold_start):
+    """Test readiness passes after warm-up when Tornado is reachable"""
+    mock_get.return_value = Mock(status_code=200)
+
+    stats = warm_up()
+    assert stats['warmed_up'] is True
+    assert stats['warmup_seconds'] >= 0
+    assert stats['import_seconds'] > 0
+
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.json['status'] == 'ready'
+    assert response.json['import_seconds'] == stats['import_seconds']
+
+@patch('flask_app.flask_app.upstream_session.get')
+def test_ready_when_tornado_unreachable(mock_get, client, cold_start):
+    """Test readiness fails when Tornado is down, while liveness still passes"""
+    mock_get.side_effect = requests.exceptions.ConnectionError()
+
+    warm_up()
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.json['status'] == 'unavailable'
+    assert client.get('/health').status_code == 200
+
+@patch('flask_app.flask_app.upstream_session.get')
 def test_call_tornado_success(mock_get, client):
     """Test successful Tornado call"""
     mock_response = Mock()
     mock_response.status_code = 200
-    mock_response.text = "Hello, world"
+    mock_response.headers = {'Content-Type': 'text/html; charset=UTF-8'}
+    mock_response.content = b"Hello, world"
+    mock_response.encoding = 'UTF-8'
     mock_get.return_value = mock_response
     
     response = client.post('/call-tornado', data={'endpoint': '/'})
@@ -33,7 +80,77 @@ def test_call_tornado_success(mock_get, client):
     assert response.json['success'] is True
     assert response.json['response_text'] == "Hello, world"
 
-@patch('flask_app.flask_app.requests.get')
+def mock_upstream(content, content_type, status_code=200, encoding=None):
+    """Build a mock requests response for the sync proxy"""
+    mock_response = Mock()
+    mock_response.status_code = status_code
+    mock_response.headers = {'Content-Type': content_type}
+    mock_response.content = content
+    mock_response.encoding = encoding
+    return mock_response
+
+@patch('flask_app.flask_app.upstream_session.get')
+def test_call_tornado_json_body_as_text_by_default(mock_get, client):
+    """Test JSON upstream bodies stay in response_text without embed_json"""
+    mock_get.return_value = mock_upstream(b'{"status": "healthy"}', 'application/json')
+    
+    response = client.post('/call-tornado', data={'endpoint': '/health'})
+    assert response.status_code == 200
+    assert response.json['response_text'] == '{"status": "healthy"}'
+    assert 'response_json' not in response.json
+
+@patch('flask_app.flask_app.upstream_session.get')
+def test_call_tornado_embeds_json_body(mock_get, client):
+    """Test embed_json=1 embeds JSON upstream bodies without re-encoding"""
+    mock_get.return_value = mock_upstream(b'{"status": "healthy"}\n', 'application/json; charset=UTF-8')
+    
+    response = client.post('/call-tornado', data={'endpoint': '/health', 'embed_json': '1'})
+    assert response.status_code == 200
+    assert response.content_type == 'application/json'
+    assert response.json['success'] is True
+    assert response.json['response_json'] == {'status': 'healthy'}
+    assert 'response_text' not in response.json
+
+@pytest.mark.parametrize('content, content_type, expected_text', [
+    (b'not json', 'application/json', 'not json'),
+    (b'  ', 'application/json', '  '),
+    ('{"status": "h\u00e9"}'.encode('utf-16'), 'application/json; charset=utf-16', '{"status": "h\u00e9"}'),
+    ('{"a":1}'.encode('utf-16-le'), 'application/json', '{"a":1}'.encode('utf-16-le').decode('utf-8', errors='replace')),
+    (b'\xef\xbb\xbf{"a":1}', 'application/json', '\ufeff{"a":1}'),
+    ('{"a":1}'.encode('utf-32'), 'application/json', '{"a":1}'.encode('utf-32').decode('utf-8', errors='replace')),
+    (b'"\xed\xa0\x80"', 'application/json', b'"\xed\xa0\x80"'.decode('utf-8', errors='replace')),
+])
+@patch('flask_app.flask_app.upstream_session.get')
+def test_call_tornado_embed_json_falls_back_to_text(mock_get, client, content, content_type, expected_text):
+    """Test malformed, blank and non-UTF-8 JSON bodies fall back to response_text"""
+    encoding = 'utf-16' if 'utf-16' in content_type else None
+    mock_get.return_value = mock_upstream(content, content_type, encoding=encoding)
+    
+    response = client.post('/call-tornado', data={'endpoint': '/', 'embed_json': '1'})
+    assert response.status_code == 200
+    json_data = response.get_json()
+    assert json_data['response_text'] == expected_text
+    assert 'response_json' not in json_data
+
+@patch('flask_app.flask_app.upstream_session.get')
+def test_call_tornado_raw_mode(mock_get, client):
+    """Test raw mode returns upstream bytes with envelope fields as headers"""
+    payload = bytes(range(256))
+    mock_response = Mock()
+    mock_response.status_code = 201
+    mock_response.headers = {'Content-Type': 'application/octet-stream'}
+    mock_response.content = payload
+    mock_get.return_value = mock_response
+    
+    response = client.post('/call-tornado', data={'endpoint': '/', 'raw': '1'})
+    assert response.status_code == 200
+    assert response.data == payload
+    assert response.content_type == 'application/octet-stream'
+    assert response.headers['X-Proxy-Success'] == 'true'
+    assert response.headers['X-Upstream-Status'] == '201'
+    assert response.headers['X-Url-Called'].endswith('/')
+
+@patch('flask_app.flask_app.upstream_session.get')
 def test_call_tornado_connection_error(mock_get, client):
     """Test Tornado connection failure"""
     mock_get.side_effect = Exception("Connection failed")
@@ -58,4 +175,59 @@ def test_call_tornado_async_endpoint_returns_json(client):
         assert 'response_text' in json_data
         assert 'status_code' in json_data
     else:
-        assert 'error' in json_data
\ No newline at end of file
+        assert 'error' in json_data
+
+@patch('flask_app.flask_app.upstream_session.get')
+def test_call_tornado_unknown_charset(mock_get, client):
+    """Test an unknown upstream charset falls back to a UTF-8 replace decode"""
+    mock_get.return_value = mock_upstream(b'Hello, \xff world', 'text/plain; charset=bogus', encoding='bogus')
+    
+    response = client.post('/call-tornado', data={'endpoint': '/'})
+    assert response.status_code == 200
+    assert response.json['response_text'] == 'Hello, \ufffd world'
+
+def mock_aiohttp_session(mock_session_cls, content, content_type, status=200, charset=None):
+    """Wire a patched aiohttp.ClientSession to return one upstream response"""
+    mock_response = MagicMock()
+    mock_response.status = status
+    mock_response.headers = {'Content-Type': content_type}
+    mock_response.charset = charset
+    mock_response.read = AsyncMock(return_value=content)
+    
+    mock_session = MagicMock()
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_session_cls.return_value.__aenter__.return_value = mock_session
+    return mock_session
+
+@patch('flask_app.flask_app.aiohttp.ClientSession')
+def test_call_tornado_async_raw_mode(mock_session_cls, client):
+    """Test async raw mode returns upstream bytes with envelope fields as headers"""
+    payload = bytes(range(256))
+    mock_aiohttp_session(mock_session_cls, payload, 'application/octet-stream', status=202)
+    
+    response = client.post('/call-tornado-async', data={'endpoint': '/', 'raw': '1'})
+    assert response.status_code == 200
+    assert response.data == payload
+    assert response.content_type == 'application/octet-stream'
+    assert response.headers['X-Proxy-Success'] == 'true'
+    assert response.headers['X-Upstream-Status'] == '202'
+
+@patch('flask_app.flask_app.aiohttp.ClientSession')
+def test_call_tornado_async_embeds_json_body(mock_session_cls, client):
+    """Test async embed_json=1 embeds JSON upstream bodies"""
+    mock_aiohttp_session(mock_session_cls, b'{"status": "healthy"}', 'application/json')
+    
+    response = client.post('/call-tornado-async', data={'endpoint': '/health', 'embed_json': '1'})
+    assert response.status_code == 200
+    assert response.json['success'] is True
+    assert response.json['status_code'] == 200
+    assert response.json['response_json'] == {'status': 'healthy'}
+
+@patch('flask_app.flask_app.aiohttp.ClientSession')
+def test_call_tornado_async_malformed_json_body(mock_session_cls, client):
+    """Test async embed_json=1 falls back to response_text for malformed JSON"""
+    mock_aiohttp_session(mock_session_cls, b'not json', 'application/json')
+    
+    response = client.post('/call-tornado-async', data={'endpoint': '/', 'embed_json': '1'})
+    assert response.status_code == 200
+    assert response.get_json()['response_text'] == 'not json'
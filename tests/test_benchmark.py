@@ -0,0 +1,101 @@
+"""
+Unit tests for the regression logic in utility_scripts/benchmark.py.
+These run without starting any services.
+"""
+
+import argparse
+import numbers
+
+import pytest
+
+import flask_app.flask_app as flask_module
+from utility_scripts.benchmark import compare, percentile, run_benchmarks
+
+
+def report(**metrics):
+    """Build a minimal benchmark report with one case"""
+    return {'results': {'flask /health': metrics}}
+
+
+class TestPercentile:
+    """Tests for the nearest-rank percentile helper"""
+
+    def test_single_value(self):
+        assert percentile([5.0], 0.95) == 5.0
+
+    def test_bounds(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.0) == 1
+        assert percentile(values, 1.0) == 100
+
+    def test_median_and_p95(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.50) == 51
+        assert percentile(values, 0.95) == 95
+
+
+class TestCompare:
+    """Tests for regression detection against a baseline"""
+
+    def test_slower_latency_is_regression(self):
+        regressions = compare(report(mean_ms=13.0), report(mean_ms=10.0), 0.2)
+        assert len(regressions) == 1
+        assert 'mean_ms' in regressions[0]
+
+    def test_faster_latency_is_not_regression(self):
+        assert compare(report(mean_ms=5.0), report(mean_ms=10.0), 0.2) == []
+
+    def test_lower_throughput_is_regression(self):
+        regressions = compare(report(throughput_rps=70.0), report(throughput_rps=100.0), 0.2)
+        assert len(regressions) == 1
+        assert 'throughput_rps' in regressions[0]
+
+    def test_higher_throughput_is_not_regression(self):
+        assert compare(report(throughput_rps=200.0), report(throughput_rps=100.0), 0.2) == []
+
+    @pytest.mark.parametrize('new, expected', [(11.9, 0), (12.0, 0), (12.1, 1)])
+    def test_threshold_boundary(self, new, expected):
+        assert len(compare(report(mean_ms=new), report(mean_ms=10.0), 0.2)) == expected
+
+    def test_retained_memory_not_compared(self):
+        current = report(retained_bytes_per_request=5000.0, retained_blocks_per_request=50.0)
+        baseline = report(retained_bytes_per_request=10.0, retained_blocks_per_request=1.0)
+        assert compare(current, baseline, 0.2) == []
+
+    def test_cases_missing_from_baseline_are_skipped(self):
+        current = {'results': {'tornado /': {'mean_ms': 100.0}}}
+        assert compare(current, report(mean_ms=1.0), 0.2) == []
+
+
+@pytest.fixture
+def restore_flask_state():
+    """Put back the Flask module state that run_benchmarks changes"""
+    base_url = flask_module.TORNADO_BASE_URL
+    stats = dict(flask_module.startup_stats)
+    testing = flask_module.app.config.get('TESTING')
+    yield
+    flask_module.TORNADO_BASE_URL = base_url
+    flask_module.startup_stats.clear()
+    flask_module.startup_stats.update(stats)
+    flask_module.app.config['TESTING'] = testing
+
+
+def test_run_benchmarks_smoke(restore_flask_state):
+    """Run one tiny case end to end against an in-process Tornado"""
+    args = argparse.Namespace(
+        delay=0, requests=3, warmup=1, concurrency=2, alloc_requests=2,
+        case=['flask /call-tornado'],
+    )
+
+    result = run_benchmarks(args)
+
+    assert set(result) == {'meta', 'results'}
+    assert result['meta']['delay'] == 0
+    assert result['meta']['requests'] == 3
+    assert list(result['results']) == ['flask /call-tornado']
+    metrics = result['results']['flask /call-tornado']
+    for key in ('mean_ms', 'p50_ms', 'p95_ms', 'max_ms', 'overhead_ms', 'throughput_rps',
+                'alloc_peak_bytes_per_request', 'alloc_peak_bytes_max',
+                'retained_bytes_per_request', 'retained_blocks_per_request'):
+        assert isinstance(metrics[key], numbers.Number), key
+    assert metrics['throughput_rps'] > 0
@@ -1,20 +1,29 @@
 import asyncio
+import time
 import tornado
 
 class MainHandler(tornado.web.RequestHandler):
     async def get(self):
         # Add 2 second delay to demonstrate async vs sync difference
-        await asyncio.sleep(2)
+        await asyncio.sleep(self.settings.get("delay", 2))
         self.write("Hello, world")
 
-def make_app():
+class HealthHandler(tornado.web.RequestHandler):
+    def get(self):
+        # No delay here, so the Flask readiness check stays cheap
+        self.write({"status": "healthy"})
+
+def make_app(delay=2):
     return tornado.web.Application([
         (r"/", MainHandler),
-    ])
+        (r"/health", HealthHandler),
+    ], delay=delay)
 
 async def main():
+    started = time.perf_counter()
     app = make_app()
     app.listen(8888, address='0.0.0.0')
+    print(f"Tornado startup took {time.perf_counter() - started:.3f}s")
     await asyncio.Event().wait()
 
 if __name__ == "__main__":
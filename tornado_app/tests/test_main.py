@@ -28,12 +28,32 @@ class TestMainHandlerHTTP(AsyncHTTPTestCase):
         # Tornado sets text/html as default content-type
         self.assertIn('text/html', response.headers.get('Content-Type', ''))
     
+    def test_health_endpoint(self):
+        """Test that /health answers immediately with JSON"""
+        response = self.fetch('/health')
+        self.assertEqual(response.code, 200)
+        self.assertIn('application/json', response.headers.get('Content-Type', ''))
+        self.assertIn(b'healthy', response.body)
+
     def test_404_for_unknown_route(self):
         """Test that unknown routes return 404"""
         response = self.fetch('/unknown')
         self.assertEqual(response.code, 404)
 
 
+class TestConfigurableDelay(AsyncHTTPTestCase):
+    """Test that the upstream delay can be configured per app"""
+    
+    def get_app(self):
+        return make_app(delay=0)
+    
+    def test_zero_delay(self):
+        """Test that a zero delay app still returns 'Hello, world'"""
+        response = self.fetch('/', request_timeout=1)
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.body.decode('utf-8'), "Hello, world")
+
+
 class TestIntegration:
     """Integration tests using pytest fixtures"""
     
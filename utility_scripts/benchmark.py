@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+In-process micro-benchmarks for the Flask proxy and Tornado hot paths.
+Starts Tornado on an ephemeral port in a background thread and drives the
+Flask app through its test client, so no docker or nginx is needed.
+
+Measures per-request latency, throughput, tracemalloc allocation peaks and
+retained block counts for Flask /health, /call-tornado and /call-tornado-async,
+plus Tornado / direct.
+
+Usage:
+  PYTHONPATH=. python utility_scripts/benchmark.py                          # default run, print results
+  PYTHONPATH=. python utility_scripts/benchmark.py --delay 0.01             # 10ms upstream delay
+  PYTHONPATH=. python utility_scripts/benchmark.py --output baseline.json   # write a baseline
+  PYTHONPATH=. python utility_scripts/benchmark.py --compare baseline.json  # fail on regressions
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import tornado.httpserver
+import tornado.netutil
+
+import flask_app.flask_app as flask_module
+from tornado_app.main import make_app
+
+# Metrics compared in --compare mode, and whether bigger is better. Retained
+# bytes and blocks are reported only, as they vary several-fold between runs
+COMPARED_METRICS = {
+    'mean_ms': False,
+    'p95_ms': False,
+    'throughput_rps': True,
+    'alloc_peak_bytes_per_request': False,
+}
+
+
+class TornadoServer:
+    """Run the Tornado app on an ephemeral port in a background thread"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.port = None
+        self._loop = None
+        self._stop = None
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        sockets = tornado.netutil.bind_sockets(0, address='127.0.0.1')
+        server = tornado.httpserver.HTTPServer(make_app(delay=self.delay))
+        server.add_sockets(sockets)
+        self.port = sockets[0].getsockname()[1]
+        self._started.set()
+        await self._stop.wait()
+        server.stop()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self._thread.start()
+        if not self._started.wait(timeout=10):
+            raise RuntimeError("Tornado benchmark server did not start within 10s")
+        return self
+
+    def __exit__(self, *exc_info):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout=10)
+
+
+def make_cases(tornado_url):
+    """Return name -> zero-argument callable making one request"""
+    # Test clients and sessions keep per-instance state, so each throughput
+    # worker thread gets its own
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = flask_module.app.test_client()
+        return local.client
+
+    def tornado_session():
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return local.session
+
+    def flask_health():
+        return client().get('/health').status_code
+
+    def flask_call_tornado():
+        return client().post('/call-tornado', data={'endpoint': '/'}).status_code
+
+    def flask_call_tornado_async():
+        return client().post('/call-tornado-async', data={'endpoint': '/'}).status_code
+
+    def tornado_root():
+        return tornado_session().get(f"{tornado_url}/", timeout=30).status_code
+
+    return {
+        'flask /health': flask_health,
+        'flask /call-tornado': flask_call_tornado,
+        'flask /call-tornado-async': flask_call_tornado_async,
+        'tornado /': tornado_root,
+    }
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_latency(call, requests_count):
+    """Time sequential requests and return latencies in milliseconds"""
+    latencies = []
+    for _ in range(requests_count):
+        started = time.perf_counter()
+        status = call()
+        latencies.append((time.perf_counter() - started) * 1000)
+        if status != 200:
+            raise RuntimeError(f"Benchmark request failed with status {status}")
+    return latencies
+
+
+def measure_throughput(call, requests_count, concurrency):
+    """Run requests across a thread pool and return requests per second"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        statuses = list(executor.map(lambda _: call(), range(requests_count)))
+    elapsed = time.perf_counter() - started
+    failed = [status for status in statuses if status != 200]
+    if failed:
+        raise RuntimeError(f"{len(failed)} benchmark requests failed during throughput run")
+    return requests_count / elapsed if elapsed > 0 else 0.0
+
+
+def measure_allocations(call, requests_count):
+    """Return (mean peak bytes, max peak bytes, retained bytes, retained blocks) per request"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        peaks = []
+        for _ in range(requests_count):
+            # Peak above the pre-request baseline is what this request allocated
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    # Memory still held after the loop; mostly cache growth, reported only
+    stats = after.compare_to(before, 'filename')
+    retained_bytes = sum(stat.size_diff for stat in stats)
+    retained_blocks = sum(stat.count_diff for stat in stats)
+    return (sum(peaks) / len(peaks), max(peaks),
+            retained_bytes / requests_count, retained_blocks / requests_count)
+
+
+def run_case(call, args):
+    """Benchmark one case and return its metrics"""
+    for _ in range(args.warmup):
+        call()
+
+    latencies = sorted(measure_latency(call, args.requests))
+    mean_ms = sum(latencies) / len(latencies)
+    throughput = measure_throughput(call, args.requests, args.concurrency)
+    alloc_peak, alloc_peak_max, retained_bytes, retained_blocks = measure_allocations(call, args.alloc_requests)
+
+    return {
+        'requests': args.requests,
+        'mean_ms': mean_ms,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'max_ms': latencies[-1],
+        'overhead_ms': mean_ms - args.delay * 1000,
+        'throughput_rps': throughput,
+        'alloc_peak_bytes_per_request': alloc_peak,
+        'alloc_peak_bytes_max': alloc_peak_max,
+        'retained_bytes_per_request': retained_bytes,
+        'retained_blocks_per_request': retained_blocks,
+    }
+
+
+def run_benchmarks(args):
+    """Start Tornado, point Flask at it and benchmark every selected case"""
+    with TornadoServer(args.delay) as tornado_server:
+        flask_module.TORNADO_BASE_URL = tornado_server.base_url
+        flask_module.app.config['TESTING'] = True
+        flask_module.warm_up()
+
+        cases = make_cases(tornado_server.base_url)
+        selected = args.case or list(cases)
+
+        results = {}
+        for name in selected:
+            print(f"⏱️  {name} ...", flush=True)
+            results[name] = run_case(cases[name], args)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'delay': args.delay,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'alloc_requests': args.alloc_requests,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return a list of regression messages for metrics worse than threshold"""
+    regressions = []
+    for name, metrics in current['results'].items():
+        base_metrics = baseline.get('results', {}).get(name)
+        if base_metrics is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base_metrics.get(metric), metrics.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            change = (new - old) / old
+            if (change < -threshold) if higher_is_better else (change > threshold):
+                regressions.append(f"{name} {metric}: {old:.2f} -> {new:.2f} ({change:+.1%})")
+    return regressions
+
+
+def print_results(report):
+    """Print a table of results"""
+    print(f"\n📊 BENCHMARK RESULTS (upstream delay {report['meta']['delay']}s):")
+    print(f"   {'case':<28}{'mean ms':>10}{'p95 ms':>10}{'overhead':>10}{'req/s':>10}{'peak B':>10}{'kept B':>10}{'kept blk':>10}")
+    for name, metrics in report['results'].items():
+        print(f"   {name:<28}{metrics['mean_ms']:>10.2f}{metrics['p95_ms']:>10.2f}"
+              f"{metrics['overhead_ms']:>10.2f}{metrics['throughput_rps']:>10.0f}"
+              f"{metrics['alloc_peak_bytes_per_request']:>10.0f}{metrics['retained_bytes_per_request']:>10.0f}"
+              f"{metrics['retained_blocks_per_request']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-process benchmarks for the Flask proxy and Tornado app')
+    parser.add_argument('--delay', type=float, default=0.0, help='Tornado upstream delay in seconds (default: 0)')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per case for latency and throughput')
+    parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per case before timing')
+    parser.add_argument('--concurrency', type=int, default=8, help='Threads for the throughput run')
+    parser.add_argument('--alloc-requests', type=int, default=50, help='Requests per case traced with tracemalloc')
+    parser.add_argument('--case', action='append', help='Only run this case (repeatable), e.g. "flask /health"')
+    parser.add_argument('--output', help='Write results as a JSON baseline to this path')
+    parser.add_argument('--compare', help='Compare against a JSON baseline and exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative regression (default: 0.2)')
+    args = parser.parse_args()
+
+    if args.case:
+        unknown = set(args.case) - set(make_cases('').keys())
+        if unknown:
+            parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            parser.error(f"baseline {args.compare} not found; create one with --output {args.compare}")
+        except json.JSONDecodeError as e:
+            parser.error(f"baseline {args.compare} is not valid JSON: {e}")
+
+    report = run_benchmarks(args)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baseline written to {args.output}")
+
+    if baseline is not None:
+        for key in ('delay', 'requests', 'concurrency'):
+            if baseline.get('meta', {}).get(key) != report['meta'][key]:
+                print(f"⚠️  Baseline {key}={baseline.get('meta', {}).get(key)} differs from this run ({report['meta'][key]})")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"   {message}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()